@@ -7,6 +7,7 @@ import json
 import shutil
 import subprocess
 import sys
+import tempfile
 from pathlib import Path
 
 from clawpet.core import (
@@ -15,13 +16,18 @@ from clawpet.core import (
     apply_passive_decay,
     auto_care_action,
     build_prompt,
-    build_snapshot_url,
+    care_payload,
     get_pet,
     interact,
+    interact_payload,
     list_pets,
     load_profile,
     parse_catime_entries,
+    pet_listing,
+    prompt_payload,
     save_profile,
+    snapshot_payload,
+    status_payload,
 )
 
 
@@ -29,6 +35,13 @@ def _profile_path(raw: str | None) -> Path | None:
     return Path(raw).expanduser() if raw else None
 
 
+def _positive_int(raw: str) -> int:
+    value = int(raw)
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be a positive integer: {raw}")
+    return value
+
+
 def _print_json(payload: dict | list) -> None:
     print(json.dumps(payload, indent=2, ensure_ascii=False))
 
@@ -44,18 +57,7 @@ def _load_live_profile(path: Path | None) -> tuple[dict, int]:
 def cmd_pets(args: argparse.Namespace) -> int:
     pets = []
     for entry in list_pets(enabled_only=not args.all):
-        pet = get_pet(entry["id"])
-        profile = pet["profile"]
-        pets.append(
-            {
-                "id": pet["id"],
-                "name_zh": profile["name_zh"],
-                "name_en": profile["name_en"],
-                "species": pet["species"],
-                "enabled": entry.get("enabled", True),
-                "summary": profile["summary"],
-            }
-        )
+        pets.append(pet_listing(entry, get_pet(entry["id"])))
 
     if args.json:
         _print_json(pets)
@@ -103,13 +105,7 @@ def cmd_status(args: argparse.Namespace) -> int:
     path = _profile_path(args.profile)
     profile, elapsed_hours = _load_live_profile(path)
     pet = get_pet(profile["adopted_pet_id"])
-    payload = {
-        "pet": pet["profile"],
-        "species": pet["species"],
-        "state": profile["state"],
-        "updated_at": profile["updated_at"],
-        "elapsed_hours": elapsed_hours,
-    }
+    payload = status_payload(pet, profile, elapsed_hours)
 
     if args.json:
         _print_json(payload)
@@ -132,7 +128,7 @@ def cmd_interact(args: argparse.Namespace) -> int:
     pet = get_pet(updated["adopted_pet_id"])
 
     if args.json:
-        _print_json({"action": args.action, "pet": pet["profile"], "state": updated["state"]})
+        _print_json(interact_payload(args.action, pet, updated))
         return 0
 
     state = updated["state"]
@@ -163,16 +159,8 @@ def cmd_prompt(args: argparse.Namespace) -> int:
         style=args.style,
     )
 
-    payload = {
-        "pet_id": pet["id"],
-        "pet_name": f"{pet['profile']['name_zh']} / {pet['profile']['name_en']}",
-        "species": pet["species"],
-        "elapsed_hours": elapsed_hours,
-        "prompt": prompt,
-    }
-
     if args.json:
-        _print_json(payload)
+        _print_json(prompt_payload(pet, prompt, elapsed_hours))
         return 0
 
     print(prompt)
@@ -197,25 +185,14 @@ def cmd_snapshot(args: argparse.Namespace) -> int:
         place=args.place,
         style=args.style,
     )
-    image_url = build_snapshot_url(prompt)
-    caption = f"🐾 {pet['profile']['name_zh']} / {pet['profile']['name_en']} 的即時快照"
-    payload = {
-        "pet_id": pet["id"],
-        "pet_name": f"{pet['profile']['name_zh']} / {pet['profile']['name_en']}",
-        "species": pet["species"],
-        "elapsed_hours": elapsed_hours,
-        "prompt": prompt,
-        "image_url": image_url,
-        "caption": caption,
-        "media": {"type": "image", "url": image_url},
-    }
+    payload = snapshot_payload(pet, prompt, elapsed_hours)
 
     if args.json:
         _print_json(payload)
         return 0
 
-    print(f"MEDIA: {image_url}")
-    print(f"CAPTION: {caption}")
+    print(f"MEDIA: {payload['image_url']}")
+    print(f"CAPTION: {payload['caption']}")
     print(f"PROMPT: {prompt}")
     return 0
 
@@ -228,12 +205,7 @@ def cmd_care(args: argparse.Namespace) -> int:
     save_profile(updated, path)
     pet = get_pet(updated["adopted_pet_id"])
 
-    payload = {
-        "pet": pet["profile"],
-        "action": chosen_action,
-        "elapsed_hours": elapsed_hours,
-        "state": updated["state"],
-    }
+    payload = care_payload(chosen_action, pet, updated, elapsed_hours)
     if args.json:
         _print_json(payload)
         return 0
@@ -288,6 +260,89 @@ def cmd_catime(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_http(args: argparse.Namespace) -> int:
+    # Imported lazily so regular commands don't pay for the HTTP stack.
+    from clawpet.server import ClawpetService, ProfileStore, make_server
+
+    state_table = None
+    if args.state_table:
+        from clawpet.sharedstate import SharedStateTable
+
+        state_table = SharedStateTable.open(args.state_table, slots=args.state_slots)
+
+    try:
+        store = ProfileStore(_profile_path(args.profile), _profile_path(args.profile_dir), state_table=state_table)
+        server = make_server(args.host, args.port, ClawpetService(store), verbose=args.verbose)
+        host, port = server.server_address[:2]
+        print(f"clawpet http serving on http://{host}:{port}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+    finally:
+        if state_table is not None:
+            state_table.close()
+    return 0
+
+
+def cmd_loadtest(args: argparse.Namespace) -> int:
+    # Imported lazily: the harness drives `main` from this module.
+    from clawpet.loadtest import DEFAULT_MIX, parse_mix, run_load_test, validate_options
+
+    if args.url and not args.workdir:
+        print(
+            "Error: --url needs --workdir; run the server with --profile-dir <workdir>/profiles",
+            file=sys.stderr,
+        )
+        return 2
+
+    options = {
+        "target": args.target,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "profiles": args.profiles,
+        "mix": None,
+        "seed": args.seed,
+        "address": args.url,
+    }
+    try:
+        options["mix"] = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+        validate_options(
+            target=args.target,
+            requests=args.requests,
+            concurrency=args.concurrency,
+            profiles=args.profiles,
+            mix=options["mix"],
+            address=args.url,
+        )
+        if args.workdir:
+            workdir = Path(args.workdir).expanduser()
+            workdir.mkdir(parents=True, exist_ok=True)
+            report = run_load_test(workdir, **options)
+        else:
+            with tempfile.TemporaryDirectory(prefix="clawpet-loadtest-") as tmp:
+                report = run_load_test(Path(tmp), **options)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        _print_json(report)
+        return 0
+
+    print(f"Target: {report['target']} ({report['requests']} requests, concurrency {report['concurrency']})")
+    print(f"Throughput: {report['throughput_rps']} req/s over {report['elapsed_seconds']}s")
+    print(f"Latency: p50 {report['latency_ms']['p50']} ms, p99 {report['latency_ms']['p99']} ms")
+    for op, stats in report["operations"].items():
+        print(f"- {op:<9} count {stats['count']:<5} errors {stats['errors']:<4} p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms")
+    print(f"Errors: {report['errors']}, lost updates: {report['lost_updates']}, corruption incidents: {report['corruption_incidents']}")
+    if report["skipped_operations"]:
+        print(f"Skipped (unsupported by target): {', '.join(report['skipped_operations'])}")
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="clawpet", description="OpenClaw pet companion CLI")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -349,12 +404,40 @@ def build_parser() -> argparse.ArgumentParser:
     catime_parser.add_argument("--json", action="store_true", help="Output JSON")
     catime_parser.set_defaults(func=cmd_catime)
 
+    http_parser = subparsers.add_parser("http", help="Serve clawpet operations as a JSON HTTP service")
+    http_parser.add_argument("--host", default="127.0.0.1", help="Bind address")
+    http_parser.add_argument("--port", type=int, default=8765, help="Bind port")
+    http_parser.add_argument("--profile", help="Default profile file path")
+    http_parser.add_argument("--profile-dir", help="Directory for named profiles (<dir>/<name>.json)")
+    http_parser.add_argument(
+        "--state-table",
+        help="Share profile state with other workers through this shared-memory table (created if missing)",
+    )
+    http_parser.add_argument("--state-slots", type=_positive_int, default=4096, help="Profiles the state table can hold")
+    http_parser.add_argument("--verbose", action="store_true", help="Log each request to stderr")
+    http_parser.set_defaults(func=cmd_http)
+
+    loadtest_parser = subparsers.add_parser("loadtest", help="Replay synthetic agent traffic and report latency/consistency")
+    loadtest_parser.add_argument("--target", choices=["cli", "core", "http"], default="core", help="Entry point under test")
+    loadtest_parser.add_argument("--requests", type=_positive_int, default=200, help="Total calls to replay")
+    loadtest_parser.add_argument("--concurrency", type=_positive_int, default=8, help="Concurrent callers")
+    loadtest_parser.add_argument("--profiles", type=_positive_int, default=20, help="Synthetic profiles to create")
+    loadtest_parser.add_argument("--mix", help="Traffic mix, e.g. status=40,care=20,interact=20,snapshot=15,catime=5")
+    loadtest_parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    loadtest_parser.add_argument("--workdir", help="Keep profiles and the catime stub here instead of a temp dir")
+    loadtest_parser.add_argument(
+        "--url",
+        help="host:port of a running `clawpet http --profile-dir <workdir>/profiles`; requires --workdir",
+    )
+    loadtest_parser.add_argument("--json", action="store_true", help="Output JSON")
+    loadtest_parser.set_defaults(func=cmd_loadtest)
+
     return parser
 
 
-def main() -> int:
+def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     return args.func(args)
 
 
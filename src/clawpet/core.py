@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import re
 from datetime import datetime, timezone
+from functools import lru_cache
 from importlib import resources
 from pathlib import Path
 from urllib.parse import quote
@@ -22,6 +23,8 @@ CATIME_HEADER_RE = re.compile(r"^Cat #\s*(\d+)\s+(\d{4}-\d{2}-\d{2} \d{2}:\d{2}
 PROFILE_TIME_FORMAT = "%Y-%m-%d %H:%M UTC"
 PASSIVE_DELTAS_PER_HOUR = {"hunger": 4, "energy": -3, "mood": -2, "bond": -1}
 MAX_PASSIVE_HOURS = 72
+PROFILE_SCHEMA_VERSION = 1
+STATE_FIELDS = ("mood", "energy", "hunger", "bond")
 
 
 def _utc_now() -> str:
@@ -52,6 +55,11 @@ def list_pets(*, enabled_only: bool = True) -> list[dict]:
     return records
 
 
+@lru_cache(maxsize=1)
+def _known_pet_ids() -> frozenset[str]:
+    return frozenset(entry["id"] for entry in list_pets(enabled_only=False) if "id" in entry)
+
+
 def get_pet(pet_id: str) -> dict:
     for entry in list_pets(enabled_only=False):
         if entry.get("id") == pet_id:
@@ -100,6 +108,71 @@ def initial_profile(pet_id: str | None = None) -> dict:
     }
 
 
+def _normalized_profile(payload: dict) -> dict:
+    """Fill missing fields from the adopted pet's defaults and clamp the state."""
+    adopted_pet_id = payload.get("adopted_pet_id") or _default_pet_id()
+    pet = get_pet(adopted_pet_id)
+    return {
+        "adopted_pet_id": pet["id"],
+        "state": _normalize_state(payload.get("state"), default_state(pet)),
+        "updated_at": payload.get("updated_at") or _utc_now(),
+    }
+
+
+def _migrate_v0_to_v1(payload: dict) -> dict:
+    """Unversioned profiles may hold partial or out-of-range state; fill and clamp it."""
+    return {"version": 1, **_normalized_profile(payload)}
+
+
+# from-version -> migration producing the next version
+PROFILE_MIGRATIONS = {
+    0: _migrate_v0_to_v1,
+}
+
+
+def migrate_profile(payload: dict) -> tuple[dict, bool]:
+    """Upgrade a stored profile payload to `PROFILE_SCHEMA_VERSION`.
+
+    Returns the payload and whether any migration ran.
+    """
+    version = payload.get("version", 0)
+    if type(version) is not int or not 0 <= version <= PROFILE_SCHEMA_VERSION:
+        raise ValueError(f"Unsupported profile version: {version!r}")
+
+    migrated = False
+    while version < PROFILE_SCHEMA_VERSION:
+        migration = PROFILE_MIGRATIONS.get(version)
+        if migration is None:
+            raise ValueError(f"No migration registered for profile version {version}")
+        payload = migration(payload)
+        next_version = payload.get("version")
+        if type(next_version) is not int or next_version <= version:
+            raise ValueError(f"Migration from profile version {version} did not advance the version")
+        version = next_version
+        migrated = True
+    return payload, migrated
+
+
+def _is_valid_state(state: object) -> bool:
+    if not isinstance(state, dict) or len(state) != len(STATE_FIELDS):
+        return False
+    for field in STATE_FIELDS:
+        value = state.get(field)
+        if type(value) is not int or not 0 <= value <= 100:
+            return False
+    return True
+
+
+def is_valid_profile(payload: dict) -> bool:
+    """Cheap check that a current-version payload needs no normalization."""
+    return (
+        payload.get("version") == PROFILE_SCHEMA_VERSION
+        and payload.get("adopted_pet_id") in _known_pet_ids()
+        and isinstance(payload.get("updated_at"), str)
+        and _is_valid_state(payload.get("state"))
+    )
+
+
 def load_profile(profile_path: Path | None = None) -> dict:
     path = profile_path or PROFILE_PATH
     if not path.exists():
@@ -110,21 +183,29 @@ def load_profile(profile_path: Path | None = None) -> dict:
     except json.JSONDecodeError as exc:
         raise ValueError(f"Invalid JSON in profile: {path}") from exc
 
-    adopted_pet_id = payload.get("adopted_pet_id") or _default_pet_id()
-    pet = get_pet(adopted_pet_id)
-    defaults = default_state(pet)
-    state = _normalize_state(payload.get("state"), defaults)
-    return {
-        "adopted_pet_id": pet["id"],
-        "state": state,
-        "updated_at": payload.get("updated_at") or _utc_now(),
-    }
+    payload, migrated = migrate_profile(payload)
+    if migrated:
+        try:
+            save_profile(payload, path)
+        except OSError:
+            # Best effort: a read-only profile still loads, it just migrates again next time.
+            pass
+
+    if is_valid_profile(payload):
+        return {
+            "adopted_pet_id": payload["adopted_pet_id"],
+            "state": dict(payload["state"]),
+            "updated_at": payload["updated_at"],
+        }
+
+    return _normalized_profile(payload)
 
 
 def save_profile(profile: dict, profile_path: Path | None = None) -> Path:
     path = profile_path or PROFILE_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(profile, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    payload = {"version": PROFILE_SCHEMA_VERSION, **{key: value for key, value in profile.items() if key != "version"}}
+    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
     return path
 
 
@@ -247,6 +328,62 @@ def build_snapshot_url(prompt: str, *, model: str = "flux", width: int = 1024, h
     )
 
 
+def pet_listing(entry: dict, pet: dict) -> dict:
+    """One `pets --json` item for an index entry and its loaded pet."""
+    profile = pet["profile"]
+    return {
+        "id": pet["id"],
+        "name_zh": profile["name_zh"],
+        "name_en": profile["name_en"],
+        "species": pet["species"],
+        "enabled": entry.get("enabled", True),
+        "summary": profile["summary"],
+    }
+
+
+def status_payload(pet: dict, profile: dict, elapsed_hours: int) -> dict:
+    return {
+        "pet": pet["profile"],
+        "species": pet["species"],
+        "state": profile["state"],
+        "updated_at": profile["updated_at"],
+        "elapsed_hours": elapsed_hours,
+    }
+
+
+def interact_payload(action: str, pet: dict, profile: dict) -> dict:
+    return {"action": action, "pet": pet["profile"], "state": profile["state"]}
+
+
+def care_payload(action: str, pet: dict, profile: dict, elapsed_hours: int) -> dict:
+    return {
+        "pet": pet["profile"],
+        "action": action,
+        "elapsed_hours": elapsed_hours,
+        "state": profile["state"],
+    }
+
+
+def prompt_payload(pet: dict, prompt: str, elapsed_hours: int) -> dict:
+    return {
+        "pet_id": pet["id"],
+        "pet_name": f"{pet['profile']['name_zh']} / {pet['profile']['name_en']}",
+        "species": pet["species"],
+        "elapsed_hours": elapsed_hours,
+        "prompt": prompt,
+    }
+
+
+def snapshot_payload(pet: dict, prompt: str, elapsed_hours: int) -> dict:
+    image_url = build_snapshot_url(prompt)
+    return {
+        **prompt_payload(pet, prompt, elapsed_hours),
+        "image_url": image_url,
+        "caption": f"🐾 {pet['profile']['name_zh']} / {pet['profile']['name_en']} 的即時快照",
+        "media": {"type": "image", "url": image_url},
+    }
+
+
 def parse_catime_entries(stdout: str) -> list[dict]:
     """Parse `catime` CLI stdout into structured entries."""
     entries: list[dict] = []
@@ -0,0 +1,366 @@
+"""Load-generation harness replaying synthetic agent traffic against clawpet."""
+
+from __future__ import annotations
+
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+import clawpet
+from clawpet.cli import main
+from clawpet.core import _utc_now, interact, list_pets, save_profile
+from clawpet.server import ClawpetClient, ClawpetService, ProfileStore, ServiceError, make_server
+
+TARGETS = ("cli", "core", "http")
+WRITE_OPS = ("care", "interact")
+DEFAULT_MIX = {"status": 40, "care": 20, "interact": 20, "snapshot": 15, "catime": 5}
+CORRUPTION_MARKER = "Invalid JSON in profile"
+
+CATIME_STUB = """#!{python}
+import sys
+
+print("Cat # 241  2026-02-11 04:57 UTC  model: stub-model")
+print("  URL: https://example.com/cat.webp")
+print("  Idea: " + " ".join(sys.argv[1:]))
+print("  Story: load test stub")
+"""
+
+
+def parse_mix(raw: str) -> dict[str, int]:
+    """Parse `op=weight,op=weight` into a traffic mix."""
+    mix = {}
+    for item in raw.split(","):
+        op, _, weight = item.strip().partition("=")
+        if op not in DEFAULT_MIX:
+            raise ValueError(f"Unsupported load-test operation: {op}")
+        try:
+            mix[op] = int(weight or 1)
+        except ValueError as exc:
+            raise ValueError(f"Invalid weight for {op}: {weight}") from exc
+        if mix[op] <= 0:
+            raise ValueError(f"Weight for {op} must be positive: {weight}")
+    return mix
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def synthesize_profiles(directory: Path, count: int, rng: random.Random) -> dict[str, dict]:
+    """Write `count` fresh profiles to `<directory>/<name>.json` and return them by name."""
+    pet_ids = [entry["id"] for entry in list_pets()]
+    profiles = {}
+    for index in range(count):
+        name = f"agent-{index:04d}"
+        profile = {
+            "adopted_pet_id": rng.choice(pet_ids),
+            "state": {field: rng.randint(20, 80) for field in ("mood", "energy", "hunger", "bond")},
+            "updated_at": _utc_now(),
+        }
+        save_profile(profile, directory / f"{name}.json")
+        profiles[name] = profile
+    return profiles
+
+
+def write_catime_stub(directory: Path) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    stub = directory / "catime"
+    stub.write_text(CATIME_STUB.format(python=sys.executable), encoding="utf-8")
+    stub.chmod(0o755)
+    return stub
+
+
+def command_argv(op: str, profile_path: Path, action: str) -> list[str]:
+    if op == "catime":
+        return ["catime", "latest", "--json"]
+    if op == "interact":
+        return ["interact", action, "--profile", str(profile_path), "--json"]
+    return [op, "--profile", str(profile_path), "--json"]
+
+
+class _ThreadLocalStream(io.TextIOBase):
+    """Routes writes to a per-thread buffer so concurrent `main()` calls stay separate."""
+
+    def __init__(self, fallback) -> None:
+        self._local = threading.local()
+        self._fallback = fallback
+
+    def capture(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        return (getattr(self._local, "buffer", None) or self._fallback).write(text)
+
+
+class CliTarget:
+    """Spawns `python -m clawpet.cli` per call, like an agent shelling out."""
+
+    supports = frozenset(DEFAULT_MIX)
+
+    def __init__(self, bin_dir: Path) -> None:
+        package_root = str(Path(clawpet.__file__).resolve().parents[1])
+        self.env = dict(os.environ)
+        self.env["PATH"] = os.pathsep.join([str(bin_dir), self.env.get("PATH", "")])
+        self.env["PYTHONPATH"] = os.pathsep.join(filter(None, [package_root, self.env.get("PYTHONPATH")]))
+
+    def call(self, argv: list[str], op: str, name: str, action: str) -> dict:
+        result = subprocess.run(
+            [sys.executable, "-m", "clawpet.cli", *argv], capture_output=True, text=True, env=self.env, check=False
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip() or f"exit code {result.returncode}")
+        return json.loads(result.stdout)
+
+    def close(self) -> None:
+        pass
+
+
+class CoreTarget:
+    """Runs the real `main(argv)` entry point in-process, one call per worker thread."""
+
+    supports = frozenset(DEFAULT_MIX)
+
+    def __init__(self, bin_dir: Path) -> None:
+        self._saved_path = os.environ.get("PATH", "")
+        os.environ["PATH"] = os.pathsep.join([str(bin_dir), self._saved_path])
+        self._stdout = _ThreadLocalStream(sys.stdout)
+        self._stderr = _ThreadLocalStream(sys.stderr)
+        self._redirects = [redirect_stdout(self._stdout), redirect_stderr(self._stderr)]
+        for redirect in self._redirects:
+            redirect.__enter__()
+
+    def call(self, argv: list[str], op: str, name: str, action: str) -> dict:
+        stdout = self._stdout.capture()
+        stderr = self._stderr.capture()
+        try:
+            code = main(argv)
+        except SystemExit as exc:
+            code = exc.code if isinstance(exc.code, int) else 2
+        if code != 0:
+            raise RuntimeError(stderr.getvalue().strip() or f"exit code {code}")
+        return json.loads(stdout.getvalue())
+
+    def close(self) -> None:
+        for redirect in reversed(self._redirects):
+            redirect.__exit__(None, None, None)
+        os.environ["PATH"] = self._saved_path
+
+
+class HttpTarget:
+    """Calls a `clawpet http` service, starting a local one when no address is given."""
+
+    supports = frozenset(DEFAULT_MIX) - {"catime"}
+
+    def __init__(self, profile_dir: Path, address: str | None = None) -> None:
+        self._server = None
+        if address:
+            host, _, port = address.rpartition(":")
+            self.host, self.port = host or "127.0.0.1", int(port)
+        else:
+            self._server = make_server("127.0.0.1", 0, ClawpetService(ProfileStore(profile_dir=profile_dir)))
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+            self.host, self.port = self._server.server_address[:2]
+        self._local = threading.local()
+        self._clients: list[ClawpetClient] = []
+        self._clients_lock = threading.Lock()
+
+    def _client(self) -> ClawpetClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = ClawpetClient(self.host, self.port)
+            with self._clients_lock:
+                self._clients.append(client)
+        return client
+
+    def call(self, argv: list[str], op: str, name: str, action: str) -> dict:
+        params: dict = {"profile": name}
+        if op == "interact":
+            params["action"] = action
+        try:
+            return self._client().call(op, **params)
+        except ServiceError as exc:
+            raise RuntimeError(exc.message) from exc
+
+    def close(self) -> None:
+        for client in self._clients:
+            client.close()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+def count_lost_updates(seed: dict, writes: list[tuple[str, dict]]) -> int:
+    """Estimate writes whose result was overwritten without ever being built upon.
+
+    In a serial history every write starts from the seed or from exactly one other
+    write's result, so all results but the last are consumed. Each result that
+    nobody consumed (besides the final one) is a lost update.
+    """
+    if not writes:
+        return 0
+
+    def apply(action: str, state: dict) -> dict:
+        return interact({"adopted_pet_id": seed["adopted_pet_id"], "state": state}, action)["state"]
+
+    consumed = [False] * len(writes)
+    seed_used = False
+    for index, (action, state) in enumerate(writes):
+        for other, (_, base) in enumerate(writes):
+            if other != index and not consumed[other] and apply(action, base) == state:
+                consumed[other] = True
+                break
+        else:
+            if not seed_used and apply(action, seed["state"]) == state:
+                seed_used = True
+    return max(0, len(writes) - 1 - sum(consumed))
+
+
+def validate_options(
+    *,
+    target: str,
+    requests: int,
+    concurrency: int,
+    profiles: int,
+    mix: dict[str, int],
+    address: str | None = None,
+) -> tuple[list[str], list[str]]:
+    """Check load-test options without side effects; returns (ops to run, skipped ops)."""
+    target_classes = {"cli": CliTarget, "core": CoreTarget, "http": HttpTarget}
+    if target not in target_classes:
+        raise ValueError(f"Unsupported target: {target}")
+    for label, value in (("requests", requests), ("concurrency", concurrency), ("profiles", profiles)):
+        if value <= 0:
+            raise ValueError(f"{label} must be positive: {value}")
+    if address and target != "http":
+        raise ValueError("A server address only applies to the http target")
+    if any(weight <= 0 for weight in mix.values()):
+        raise ValueError("Traffic mix weights must be positive")
+
+    supports = target_classes[target].supports
+    ops = [op for op in mix if op in supports]
+    if not ops:
+        raise ValueError(f"No operation in the traffic mix is supported by the {target} target")
+    return ops, sorted(op for op in mix if op not in supports)
+
+
+def run_load_test(
+    workdir: Path,
+    *,
+    target: str = "core",
+    requests: int = 200,
+    concurrency: int = 8,
+    profiles: int = 20,
+    mix: dict[str, int] | None = None,
+    seed: int = 0,
+    address: str | None = None,
+) -> dict:
+    """Replay a random traffic mix against one target and summarize the run."""
+    weights = mix or DEFAULT_MIX
+    ops, skipped = validate_options(
+        target=target, requests=requests, concurrency=concurrency, profiles=profiles, mix=weights, address=address
+    )
+
+    rng = random.Random(seed)
+    profile_dir = workdir / "profiles"
+    population = synthesize_profiles(profile_dir, profiles, rng)
+    bin_dir = write_catime_stub(workdir / "bin").parent
+
+    if target == "cli":
+        runner = CliTarget(bin_dir)
+    elif target == "core":
+        runner = CoreTarget(bin_dir)
+    else:
+        runner = HttpTarget(profile_dir, address)
+
+    names = list(population)
+    plan = []
+    for _ in range(requests):
+        op = rng.choices(ops, weights=[weights[op] for op in ops])[0]
+        plan.append((op, rng.choice(names), rng.choice(("feed", "play", "rest"))))
+
+    results_lock = threading.Lock()
+    latencies: dict[str, list[float]] = {op: [] for op in ops}
+    errors: dict[str, int] = {op: 0 for op in ops}
+    error_samples: list[str] = []
+    writes: dict[str, list[tuple[str, dict]]] = {name: [] for name in names}
+    corruption = 0
+
+    def run_one(item: tuple[str, str, str]) -> None:
+        nonlocal corruption
+        op, name, action = item
+        argv = command_argv(op, profile_dir / f"{name}.json", action)
+        started = time.perf_counter()
+        try:
+            payload = runner.call(argv, op, name, action)
+            failure = None
+        except Exception as exc:  # noqa: BLE001 - every failure is a data point here
+            payload, failure = None, str(exc) or type(exc).__name__
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with results_lock:
+            latencies[op].append(elapsed_ms)
+            if failure is not None:
+                errors[op] += 1
+                corruption += CORRUPTION_MARKER in failure
+                if len(error_samples) < 5:
+                    error_samples.append(f"{op}: {failure.splitlines()[-1]}")
+            elif op in WRITE_OPS:
+                writes[name].append((payload["action"], payload["state"]))
+
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(run_one, plan))
+    finally:
+        runner.close()
+    elapsed = time.perf_counter() - started
+
+    for name in names:
+        try:
+            json.loads((profile_dir / f"{name}.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            corruption += 1
+
+    all_latencies = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "target": target,
+        "requests": len(plan),
+        "concurrency": concurrency,
+        "profiles": profiles,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(plan) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(all_latencies, 0.50), 3),
+            "p99": round(percentile(all_latencies, 0.99), 3),
+        },
+        "operations": {
+            op: {
+                "count": len(latencies[op]),
+                "errors": errors[op],
+                "p50_ms": round(percentile(latencies[op], 0.50), 3),
+                "p99_ms": round(percentile(latencies[op], 0.99), 3),
+            }
+            for op in ops
+        },
+        "errors": sum(errors.values()),
+        "error_samples": error_samples,
+        "lost_updates": sum(count_lost_updates(population[name], writes[name]) for name in names),
+        "corruption_incidents": corruption,
+        "skipped_operations": skipped,
+    }
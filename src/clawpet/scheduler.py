@@ -0,0 +1,114 @@
+"""Reminder scheduling based on predicted passive threshold crossings."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import math
+from datetime import datetime, timedelta
+
+from clawpet.core import MAX_PASSIVE_HOURS, PASSIVE_DELTAS_PER_HOUR, _parse_utc
+
+# name -> (field, comparison, threshold); mirrors auto_care_action / suggest_activity.
+REMINDER_THRESHOLDS = {
+    "hungry": ("hunger", ">=", 70),
+    "snack_hunting": ("hunger", ">=", 75),
+    "tired": ("energy", "<=", 35),
+    "napping": ("energy", "<=", 30),
+}
+
+
+def hours_until_threshold(value: int, per_hour: int, comparison: str, threshold: int) -> int | None:
+    """Whole passive hours until `value` satisfies the threshold, or None if never."""
+    if comparison == ">=":
+        if value >= threshold:
+            return 0
+        if per_hour <= 0:
+            return None
+        return math.ceil((threshold - value) / per_hour)
+    if comparison == "<=":
+        if value <= threshold:
+            return 0
+        if per_hour >= 0:
+            return None
+        return math.ceil((value - threshold) / -per_hour)
+    raise ValueError(f"Unsupported comparison: {comparison}")
+
+
+def threshold_crossings(profile: dict, thresholds: dict | None = None) -> list[dict]:
+    """Predict when each reminder threshold is crossed under passive decay.
+
+    Passive decay is linear and applied in whole hours since `updated_at`, so each
+    crossing time is exact. Crossings beyond `MAX_PASSIVE_HOURS` never happen.
+    """
+    updated_at = _parse_utc(profile.get("updated_at", ""))
+    if updated_at is None:
+        return []
+
+    crossings = []
+    state = profile["state"]
+    for name, (field, comparison, threshold) in (thresholds or REMINDER_THRESHOLDS).items():
+        hours = hours_until_threshold(state[field], PASSIVE_DELTAS_PER_HOUR.get(field, 0), comparison, threshold)
+        if hours is None or hours > MAX_PASSIVE_HOURS:
+            continue
+        crossings.append(
+            {
+                "reminder": name,
+                "field": field,
+                "threshold": threshold,
+                "pet_id": profile["adopted_pet_id"],
+                "due_at": updated_at + timedelta(hours=hours),
+            }
+        )
+    crossings.sort(key=lambda event: event["due_at"])
+    return crossings
+
+
+class ReminderScheduler:
+    """Min-heap of predicted reminder events across many profiles.
+
+    Re-scheduling a key (after an interaction changed its state) invalidates its
+    earlier events lazily: stale heap entries are dropped when they surface.
+    """
+
+    def __init__(self, thresholds: dict | None = None) -> None:
+        self.thresholds = thresholds or REMINDER_THRESHOLDS
+        self._heap: list[tuple[datetime, int, int, str, dict]] = []
+        self._generations: dict[str, int] = {}
+        self._counter = itertools.count()
+
+    def schedule(self, key: str, profile: dict) -> list[dict]:
+        generation = self._generations.get(key, 0) + 1
+        self._generations[key] = generation
+        events = threshold_crossings(profile, self.thresholds)
+        for event in events:
+            event["key"] = key
+            heapq.heappush(self._heap, (event["due_at"], next(self._counter), generation, key, event))
+        return events
+
+    def cancel(self, key: str) -> None:
+        if key in self._generations:
+            self._generations[key] += 1
+
+    def _discard_stale(self) -> None:
+        while self._heap:
+            _, _, generation, key, _ = self._heap[0]
+            if self._generations.get(key) == generation:
+                return
+            heapq.heappop(self._heap)
+
+    def next_due(self) -> datetime | None:
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[dict]:
+        """Remove and return every live event due at or before `now`, in due order."""
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            due.append(heapq.heappop(self._heap)[4])
+
+    def __len__(self) -> int:
+        return sum(1 for _, _, generation, key, _ in self._heap if self._generations.get(key) == generation)
@@ -0,0 +1,426 @@
+"""HTTP service front end for clawpet."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlsplit
+
+from clawpet.core import (
+    PROFILE_PATH,
+    apply_passive_decay,
+    auto_care_action,
+    build_prompt,
+    care_payload,
+    get_pet,
+    interact,
+    interact_payload,
+    list_pets,
+    load_profile,
+    pet_listing,
+    prompt_payload,
+    save_profile,
+    snapshot_payload,
+    status_payload,
+)
+
+if TYPE_CHECKING:
+    from clawpet.sharedstate import SharedStateTable
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 1024 * 1024
+PROFILE_NAME_RE = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$")
+WRITE_OPERATIONS = frozenset({"interact", "care"})
+TEXT_PARAMS = ("profile", "pet_id", "action", "mood", "place", "style")
+
+
+class ServiceError(Exception):
+    """Request-level failure that maps to an HTTP status code."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _flag(value: object) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(value)
+
+
+def _internal_error(exc: Exception) -> str:
+    return f"Internal error: {type(exc).__name__}: {exc}"
+
+
+class PetCatalog:
+    """Process-wide cache of the packaged pet catalog."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries: list[dict] | None = None
+        self._pets: dict[str, dict] = {}
+
+    def entries(self, *, enabled_only: bool = True) -> list[dict]:
+        with self._lock:
+            if self._entries is None:
+                self._entries = list_pets(enabled_only=False)
+            records = self._entries
+        if enabled_only:
+            return [record for record in records if record.get("enabled", True)]
+        return records
+
+    def get(self, pet_id: str) -> dict:
+        with self._lock:
+            pet = self._pets.get(pet_id)
+        if pet is not None:
+            return pet
+
+        if not any(entry.get("id") == pet_id for entry in self.entries(enabled_only=False)):
+            raise ServiceError(404, f"Unknown pet id: {pet_id}")
+        pet = get_pet(pet_id)
+        with self._lock:
+            return self._pets.setdefault(pet_id, pet)
+
+
+class ProfileStore:
+    """Serialized, cached access to profile files.
+
+    Each profile path gets its own lock so read-modify-write cycles from
+    concurrent requests never interleave. Loaded profiles stay cached and are
+    only re-read when the file's mtime changes underneath the service.
+
+    With a `SharedStateTable`, several worker processes share one in-memory view
+    of every profile instead: reads are served from the table without touching
+    the filesystem, and saves write the file and then the table. The per-path
+    locks are process-local and the table only makes each record write atomic,
+    so it does not prevent lost updates when two workers modify the same profile
+    at once; route writes for one profile to a single worker.
+    """
+
+    def __init__(
+        self,
+        default_path: Path | None = None,
+        profile_dir: Path | None = None,
+        *,
+        state_table: SharedStateTable | None = None,
+    ) -> None:
+        self.default_path = default_path or PROFILE_PATH
+        self.profile_dir = profile_dir
+        self.state_table = state_table
+        self._locks_guard = threading.Lock()
+        self._locks: dict[Path, threading.Lock] = {}
+        self._cache: dict[Path, tuple[int | None, dict]] = {}
+
+    def resolve(self, name: str | None) -> Path:
+        if not name:
+            return self.default_path
+        if self.profile_dir is None:
+            raise ServiceError(400, "Named profiles require the server to run with --profile-dir")
+        if not PROFILE_NAME_RE.match(name):
+            raise ServiceError(400, f"Invalid profile name: {name}")
+        return self.profile_dir / f"{name}.json"
+
+    def lock_for(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            lock = self._locks.get(path)
+            if lock is None:
+                lock = self._locks[path] = threading.Lock()
+            return lock
+
+    @staticmethod
+    def _mtime(path: Path) -> int | None:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _read(path: Path) -> dict:
+        try:
+            return load_profile(path)
+        except ValueError as exc:
+            # A broken or unsupported profile file is a server-side problem, not a bad request.
+            raise ServiceError(500, str(exc)) from exc
+
+    def _load(self, path: Path) -> dict:
+        if self.state_table is not None:
+            shared = self.state_table.get(str(path))
+            if shared is not None:
+                return shared
+            profile = self._read(path)
+            self.state_table.put_if_absent(str(path), profile)
+            return profile
+
+        mtime = self._mtime(path)
+        cached = self._cache.get(path)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            return cached[1]
+        profile = self._read(path)
+        if mtime is not None:
+            self._cache[path] = (mtime, profile)
+        return profile
+
+    def save(self, profile: dict, path: Path) -> None:
+        save_profile(profile, path)
+        if self.state_table is not None:
+            self.state_table.put(str(path), profile)
+            return
+        self._cache[path] = (self._mtime(path), profile)
+
+    def load_live(self, path: Path) -> tuple[dict, int]:
+        """Load a profile and apply passive decay; caller must hold the path lock."""
+        profile = self._load(path)
+        refreshed, elapsed_hours = apply_passive_decay(profile)
+        if elapsed_hours > 0:
+            self.save(refreshed, path)
+        return refreshed, elapsed_hours
+
+
+class ClawpetService:
+    """JSON operations mirroring the `--json` output of the CLI commands."""
+
+    def __init__(self, store: ProfileStore | None = None, catalog: PetCatalog | None = None) -> None:
+        self.store = store or ProfileStore()
+        self.catalog = catalog or PetCatalog()
+        self.operations = {
+            "pets": self.op_pets,
+            "show": self.op_show,
+            "status": self.op_status,
+            "interact": self.op_interact,
+            "care": self.op_care,
+            "prompt": self.op_prompt,
+            "snapshot": self.op_snapshot,
+        }
+
+    def dispatch(self, op: str, params: dict) -> dict | list:
+        handler = self.operations.get(op)
+        if handler is None:
+            raise ServiceError(404, f"Unknown operation: {op}")
+        for key in TEXT_PARAMS:
+            if params.get(key) is not None and not isinstance(params[key], str):
+                raise ServiceError(400, f"Parameter '{key}' must be a string")
+        try:
+            return handler(params)
+        except (TypeError, ValueError) as exc:
+            raise ServiceError(400, str(exc)) from exc
+
+    def batch(self, requests: list) -> list[dict]:
+        results = []
+        for item in requests:
+            if not isinstance(item, dict) or not isinstance(item.get("op"), str):
+                results.append({"ok": False, "status": 400, "error": "Each batch item needs an 'op' string"})
+                continue
+            params = {key: value for key, value in item.items() if key != "op"}
+            try:
+                results.append({"ok": True, "result": self.dispatch(item["op"], params)})
+            except ServiceError as exc:
+                results.append({"ok": False, "status": exc.status, "error": exc.message})
+            except Exception as exc:  # noqa: BLE001 - one broken item must not sink the batch
+                results.append({"ok": False, "status": 500, "error": _internal_error(exc)})
+        return results
+
+    def op_pets(self, params: dict) -> list[dict]:
+        return [
+            pet_listing(entry, self.catalog.get(entry["id"]))
+            for entry in self.catalog.entries(enabled_only=not _flag(params.get("all", False)))
+        ]
+
+    def op_show(self, params: dict) -> dict:
+        pet_id = params.get("pet_id")
+        if not pet_id:
+            raise ValueError("Missing pet_id")
+        return self.catalog.get(pet_id)
+
+    def op_status(self, params: dict) -> dict:
+        path = self.store.resolve(params.get("profile"))
+        with self.store.lock_for(path):
+            profile, elapsed_hours = self.store.load_live(path)
+        return status_payload(self.catalog.get(profile["adopted_pet_id"]), profile, elapsed_hours)
+
+    def op_interact(self, params: dict) -> dict:
+        action = params.get("action")
+        if not action:
+            raise ValueError("Missing action")
+        path = self.store.resolve(params.get("profile"))
+        with self.store.lock_for(path):
+            profile, _ = self.store.load_live(path)
+            updated = interact(profile, action)
+            self.store.save(updated, path)
+        return interact_payload(action, self.catalog.get(updated["adopted_pet_id"]), updated)
+
+    def op_care(self, params: dict) -> dict:
+        path = self.store.resolve(params.get("profile"))
+        with self.store.lock_for(path):
+            profile, elapsed_hours = self.store.load_live(path)
+            chosen_action = params.get("action") or auto_care_action(profile["state"])
+            updated = interact(profile, chosen_action)
+            self.store.save(updated, path)
+        return care_payload(chosen_action, self.catalog.get(updated["adopted_pet_id"]), updated, elapsed_hours)
+
+    def _prompt_context(self, params: dict) -> tuple[dict, int, str]:
+        if params.get("pet_id"):
+            pet = self.catalog.get(params["pet_id"])
+            state = pet["state_defaults"]
+            elapsed_hours = 0
+        else:
+            path = self.store.resolve(params.get("profile"))
+            with self.store.lock_for(path):
+                profile, elapsed_hours = self.store.load_live(path)
+            pet = self.catalog.get(profile["adopted_pet_id"])
+            state = profile["state"]
+
+        options = {key: params[key] for key in ("place", "style") if params.get(key)}
+        prompt = build_prompt(pet, state, mood=params.get("mood"), **options)
+        return pet, elapsed_hours, prompt
+
+    def op_prompt(self, params: dict) -> dict:
+        pet, elapsed_hours, prompt = self._prompt_context(params)
+        return prompt_payload(pet, prompt, elapsed_hours)
+
+    def op_snapshot(self, params: dict) -> dict:
+        pet, elapsed_hours, prompt = self._prompt_context(params)
+        return snapshot_payload(pet, prompt, elapsed_hours)
+
+
+class ClawpetRequestHandler(BaseHTTPRequestHandler):
+    """Routes `GET|POST /<op>` and `POST /batch` to the server's service."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "clawpet"
+    # Headers and body go out in separate writes; without TCP_NODELAY keep-alive
+    # clients stall on delayed ACKs.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args: object) -> None:
+        if getattr(self.server, "verbose", False):
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, payload: object) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        """Consume the whole request body so the next keep-alive request starts cleanly."""
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError as exc:
+            self.close_connection = True
+            raise ServiceError(400, "Invalid Content-Length") from exc
+        if length < 0:
+            self.close_connection = True
+            raise ServiceError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise ServiceError(413, "Request body too large")
+        return self.rfile.read(length) if length else b""
+
+    @staticmethod
+    def _parse_body(raw: bytes) -> object:
+        if not raw:
+            return {}
+        try:
+            return json.loads(raw.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise ServiceError(400, "Request body must be JSON") from exc
+
+    def _handle(self, method: str) -> None:
+        service: ClawpetService = self.server.service
+        url = urlsplit(self.path)
+        op = url.path.strip("/")
+        try:
+            raw_body = self._read_body()
+            params = dict(parse_qsl(url.query))
+            body = self._parse_body(raw_body) if method == "POST" else {}
+            if op == "batch":
+                if method != "POST":
+                    raise ServiceError(405, "Batch requires POST")
+                requests = body.get("requests") if isinstance(body, dict) else body
+                if not isinstance(requests, list):
+                    raise ServiceError(400, "Batch body must be a list or {\"requests\": [...]}")
+                payload = service.batch(requests)
+            else:
+                if not isinstance(body, dict):
+                    raise ServiceError(400, "Request body must be a JSON object")
+                params.update(body)
+                payload = service.dispatch(op, params)
+        except ServiceError as exc:
+            self._send_json(exc.status, {"error": exc.message})
+            return
+        except Exception as exc:  # noqa: BLE001 - always answer with JSON
+            self.log_error("Unhandled error for %s: %r", self.path, exc)
+            self._send_json(500, {"error": _internal_error(exc)})
+            return
+        self._send_json(200, payload)
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+
+def make_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    service: ClawpetService | None = None,
+    *,
+    verbose: bool = False,
+) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), ClawpetRequestHandler)
+    server.daemon_threads = True
+    server.service = service or ClawpetService()
+    server.verbose = verbose
+    return server
+
+
+class ClawpetClient:
+    """Minimal JSON client that reuses one keep-alive connection."""
+
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, *, timeout: float = 10.0) -> None:
+        self._connection = http.client.HTTPConnection(host, port, timeout=timeout)
+
+    def _request(self, path: str, payload: object, *, idempotent: bool) -> tuple[int, object]:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        reused = self._connection.sock is not None
+        sent = False
+        try:
+            self._connection.request("POST", path, body=body, headers=headers)
+            sent = True
+            response = self._connection.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            self._connection.close()
+            # Retry only when a reused idle socket failed; once a write op reached the
+            # server it may already have been applied, so it is never re-sent.
+            if not reused or (sent and not idempotent):
+                raise
+            self._connection.request("POST", path, body=body, headers=headers)
+            response = self._connection.getresponse()
+        return response.status, json.loads(response.read().decode("utf-8"))
+
+    def call(self, op: str, **params: object) -> dict | list:
+        status, payload = self._request(f"/{op}", params, idempotent=op not in WRITE_OPERATIONS)
+        if status != 200:
+            raise ServiceError(status, payload.get("error", "Request failed"))
+        return payload
+
+    def batch(self, requests: list[dict]) -> list[dict]:
+        idempotent = not any(item.get("op") in WRITE_OPERATIONS for item in requests)
+        status, payload = self._request("/batch", {"requests": requests}, idempotent=idempotent)
+        if status != 200:
+            raise ServiceError(status, payload.get("error", "Request failed"))
+        return payload
+
+    def close(self) -> None:
+        self._connection.close()
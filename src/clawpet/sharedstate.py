@@ -0,0 +1,292 @@
+"""Shared-memory pet state table for multi-process deployments.
+
+Each profile occupies one fixed-width slot in a `multiprocessing.shared_memory`
+block. Slots are guarded by a seqlock: writers bump the sequence to an odd value,
+write the record, then bump it back to even; readers retry whenever they observe
+an odd or changed sequence. Reads never block and never touch the filesystem;
+a slot left odd by a crashed writer reads as a miss until the next `put`
+repairs it. Writers serialize on an `flock` lock file named after the block
+unless another cross-process lock is passed in. Profile files remain the
+durable copy.
+
+The header counts attached processes; the last one to `close()` removes the
+block and its lock file. A worker that dies without closing leaks its
+reference, so the block then has to be removed by hand (`/dev/shm/<name>`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from calendar import timegm
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from multiprocessing import shared_memory
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from clawpet.core import PROFILE_TIME_FORMAT, STATE_FIELDS, _parse_utc, list_pets
+
+# magic, table version, slot count, attached processes
+HEADER = struct.Struct("<4sHxxII")
+HEADER_MAGIC = b"CPST"
+TABLE_VERSION = 1
+# seq, key digest, mood, energy, hunger, bond, pet index, padding, updated_at (epoch seconds)
+SLOT = struct.Struct("<I16s4BH2xq")
+SEQ = struct.Struct("<I")
+BODY_OFFSET = SEQ.size
+EMPTY_KEY = bytes(16)
+DEFAULT_SLOTS = 4096
+READ_RETRIES = 1000
+ATTACH_RETRIES = 50
+
+
+def _key_digest(key: str) -> bytes:
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+    # The all-zero digest marks an empty slot.
+    return digest if digest != EMPTY_KEY else b"\x01" + digest[1:]
+
+
+@contextmanager
+def _untracked():
+    """Keep the resource tracker away from the block.
+
+    Its lifetime is governed by the attach count in the header, not by whichever
+    process happened to create it (Python < 3.13 has no `track=False`).
+    """
+    from multiprocessing import resource_tracker
+
+    register, unregister = resource_tracker.register, resource_tracker.unregister
+    resource_tracker.register = resource_tracker.unregister = lambda name, rtype: None
+    try:
+        yield
+    finally:
+        resource_tracker.register, resource_tracker.unregister = register, unregister
+
+
+class _FileLock:
+    """Exclusive `flock` on a lock file, shared by every process using the same path."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd: int | None = None
+        self._pid: int | None = None
+
+    def _reopen(self) -> None:
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._pid = os.getpid()
+
+    def __enter__(self) -> "_FileLock":
+        self._thread_lock.acquire()
+        try:
+            if self._pid != os.getpid():
+                # A forked child shares the parent's open file description, and flock
+                # would treat both as one holder; each process needs its own descriptor.
+                self._fd = None
+                self._reopen()
+            while True:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+                # The last process to detach removes the lock file; if that happened
+                # while we waited, lock the file at the path now instead.
+                try:
+                    if os.stat(self.path).st_ino == os.fstat(self._fd).st_ino:
+                        break
+                except FileNotFoundError:
+                    pass
+                self._reopen()
+        except BaseException:
+            self._thread_lock.release()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def close(self) -> None:
+        with self._thread_lock:
+            if self._fd is not None and self._pid == os.getpid():
+                os.close(self._fd)
+            self._fd = self._pid = None
+
+
+def _default_lock(name: str) -> _FileLock:
+    if fcntl is None:
+        raise ValueError("No cross-process lock available on this platform; pass lock= explicitly")
+    return _FileLock(Path(tempfile.gettempdir()) / f"clawpet-{name.lstrip('/')}.lock")
+
+
+class SharedStateTable:
+    """Fixed-capacity, open-addressed table of packed pet state records."""
+
+    def __init__(self, block: shared_memory.SharedMemory, *, lock=None) -> None:
+        self._block = block
+        self._buf = block.buf
+        self._lock = lock or _default_lock(block.name)
+        self.slots = 0
+        self._pet_ids = [entry["id"] for entry in list_pets(enabled_only=False)]
+        self._pet_indexes = {pet_id: index for index, pet_id in enumerate(self._pet_ids)}
+
+    def _adjust_attached(self, delta: int) -> int:
+        """Change the attach count; caller must hold the writer lock."""
+        magic, version, slots, attached = HEADER.unpack_from(self._buf, 0)
+        HEADER.pack_into(self._buf, 0, magic, version, slots, attached + delta)
+        return attached + delta
+
+    @classmethod
+    def create(cls, name: str | None = None, *, slots: int = DEFAULT_SLOTS, lock=None) -> "SharedStateTable":
+        size = HEADER.size + SLOT.size * slots
+        with _untracked():
+            block = shared_memory.SharedMemory(name=name, create=True, size=size)
+        table = cls(block, lock=lock)
+        with table._lock:
+            block.buf[:size] = bytes(size)
+            HEADER.pack_into(block.buf, 0, HEADER_MAGIC, TABLE_VERSION, slots, 1)
+        table.slots = slots
+        return table
+
+    @classmethod
+    def attach(cls, name: str, *, lock=None) -> "SharedStateTable":
+        with _untracked():
+            block = shared_memory.SharedMemory(name=name)
+        table = cls(block, lock=lock)
+        try:
+            with table._lock:
+                magic, version, slots, attached = HEADER.unpack_from(block.buf, 0)
+                if magic != HEADER_MAGIC or version != TABLE_VERSION:
+                    raise ValueError(f"Not a clawpet state table: {name}")
+                if attached <= 0:
+                    raise FileNotFoundError(f"State table is being removed: {name}")
+                table._adjust_attached(1)
+        except BaseException:
+            table._release()
+            raise
+        table.slots = slots
+        return table
+
+    @classmethod
+    def open(cls, name: str, *, slots: int = DEFAULT_SLOTS, lock=None) -> "SharedStateTable":
+        """Attach to `name`, creating it if no worker has yet."""
+        for _ in range(ATTACH_RETRIES):
+            try:
+                return cls.create(name, slots=slots, lock=lock)
+            except FileExistsError:
+                pass
+            try:
+                return cls.attach(name, lock=lock)
+            except (FileNotFoundError, ValueError):
+                # Lost a race with the creator initializing it or the last worker removing it.
+                time.sleep(0.05)
+        raise RuntimeError(f"Could not open state table: {name}")
+
+    @property
+    def name(self) -> str:
+        return self._block.name
+
+    def _offset(self, slot: int) -> int:
+        return HEADER.size + SLOT.size * slot
+
+    def _read_slot(self, offset: int) -> tuple | None:
+        for _ in range(READ_RETRIES):
+            before = SEQ.unpack_from(self._buf, offset)[0]
+            if before & 1:
+                continue
+            record = SLOT.unpack_from(self._buf, offset)
+            if SEQ.unpack_from(self._buf, offset)[0] == before:
+                return record
+        return None
+
+    def _find(self, digest: bytes) -> tuple[int, bool]:
+        """Return (offset, found); offset is the first free slot when not found, -1 if full."""
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        for probe in range(self.slots):
+            offset = self._offset((start + probe) % self.slots)
+            slot_key = self._buf[offset + BODY_OFFSET : offset + BODY_OFFSET + 16]
+            if slot_key == digest:
+                return offset, True
+            if slot_key == EMPTY_KEY:
+                return offset, False
+        return -1, False
+
+    def get(self, key: str) -> dict | None:
+        """Return the profile stored for `key`, or None when it is not cached."""
+        digest = _key_digest(key)
+        offset, found = self._find(digest)
+        if not found:
+            return None
+
+        record = self._read_slot(offset)
+        if record is None:
+            return None
+        _, slot_key, mood, energy, hunger, bond, pet_index, updated_at = record
+        if slot_key != digest:
+            return None
+        return {
+            "adopted_pet_id": self._pet_ids[pet_index],
+            "state": {"mood": mood, "energy": energy, "hunger": hunger, "bond": bond},
+            "updated_at": (
+                datetime.fromtimestamp(updated_at, timezone.utc).strftime(PROFILE_TIME_FORMAT) if updated_at else ""
+            ),
+        }
+
+    def put(self, key: str, profile: dict) -> bool:
+        """Store a profile record; returns False if it cannot be represented or the table is full."""
+        return self._store(key, profile, replace=True)
+
+    def put_if_absent(self, key: str, profile: dict) -> bool:
+        """Store a record only if `key` has none yet, e.g. when filling a miss from disk.
+
+        Checked under the writer lock, so a stale file read can never overwrite a
+        record a writer stored after saving a newer file.
+        """
+        return self._store(key, profile, replace=False)
+
+    def _store(self, key: str, profile: dict, *, replace: bool) -> bool:
+        pet_index = self._pet_indexes.get(profile.get("adopted_pet_id"))
+        if pet_index is None:
+            return False
+        parsed = _parse_utc(profile.get("updated_at", ""))
+        updated_at = timegm(parsed.utctimetuple()) if parsed else 0
+        stats = [max(0, min(100, int(profile["state"][field]))) for field in STATE_FIELDS]
+        digest = _key_digest(key)
+
+        with self._lock:
+            offset, found = self._find(digest)
+            if offset < 0 or (found and not replace):
+                return False
+            current = SEQ.unpack_from(self._buf, offset)[0]
+            # Holding the lock, an odd counter can only be left by a writer that died
+            # mid-write; reuse it instead of flipping the parity of the protocol.
+            writing = current if current & 1 else (current + 1) & 0xFFFFFFFF
+            SEQ.pack_into(self._buf, offset, writing)
+            SLOT.pack_into(self._buf, offset, writing, digest, *stats, pet_index, updated_at)
+            SEQ.pack_into(self._buf, offset, (writing + 1) & 0xFFFFFFFF)
+        return True
+
+    def _release(self) -> None:
+        self._buf = None
+        self._block.close()
+        if isinstance(self._lock, _FileLock):
+            self._lock.close()
+
+    def close(self) -> None:
+        """Detach; the last attached process also removes the block and lock file."""
+        with self._lock:
+            last = self._adjust_attached(-1) <= 0
+            if last:
+                with _untracked():
+                    self._block.unlink()
+                if isinstance(self._lock, _FileLock):
+                    self._lock.path.unlink(missing_ok=True)
+        self._release()
@@ -1,8 +1,13 @@
+import json
 from pathlib import Path
 
 from datetime import datetime, timezone
 
+import pytest
+
+from clawpet import core
 from clawpet.core import (
+    PROFILE_SCHEMA_VERSION,
     adopt_pet,
     apply_passive_decay,
     auto_care_action,
@@ -91,3 +96,54 @@ def test_build_snapshot_url_returns_http_url():
     assert url.startswith("https://image.pollinations.ai/prompt/")
     assert "A%20cat%20playing%20with%20a%20red%20ball" in url
     assert "model=flux" in url
+
+
+def test_load_profile_migrates_unversioned_file_in_place(tmp_path: Path):
+    profile_file = tmp_path / "profile.json"
+    profile_file.write_text(
+        json.dumps({"adopted_pet_id": "captain", "state": {"mood": 140}, "updated_at": "2026-02-12 00:00 UTC"}),
+        encoding="utf-8",
+    )
+    profile = load_profile(profile_file)
+    assert profile["state"]["mood"] == 100
+    stored = json.loads(profile_file.read_text(encoding="utf-8"))
+    assert stored["version"] == PROFILE_SCHEMA_VERSION
+    assert stored["state"] == profile["state"]
+
+
+def test_load_profile_skips_catalog_for_valid_profile(tmp_path: Path, monkeypatch):
+    profile_file = tmp_path / "profile.json"
+    adopt_pet("momo", profile_file)
+
+    def fail_get_pet(pet_id):
+        raise AssertionError("catalog lookup on valid profile")
+
+    monkeypatch.setattr(core, "get_pet", fail_get_pet)
+    assert load_profile(profile_file)["adopted_pet_id"] == "momo"
+
+
+@pytest.mark.parametrize("version", [PROFILE_SCHEMA_VERSION + 1, -1, True, "1"])
+def test_load_profile_rejects_unsupported_schema_version(tmp_path: Path, version):
+    profile_file = tmp_path / "profile.json"
+    profile_file.write_text(json.dumps({"version": version}), encoding="utf-8")
+    with pytest.raises(ValueError):
+        load_profile(profile_file)
+
+
+def test_load_profile_migrates_read_only_profile_without_rewriting(tmp_path: Path, monkeypatch):
+    profile_file = tmp_path / "profile.json"
+    profile_file.write_text(json.dumps({"adopted_pet_id": "momo", "state": {"mood": 5}}), encoding="utf-8")
+
+    def read_only(*args, **kwargs):
+        raise PermissionError("read-only file system")
+
+    monkeypatch.setattr(core, "save_profile", read_only)
+    profile = load_profile(profile_file)
+    assert profile["state"]["mood"] == 5
+    assert "version" not in json.loads(profile_file.read_text(encoding="utf-8"))
+
+
+def test_migrate_profile_rejects_migration_that_does_not_advance(monkeypatch):
+    monkeypatch.setitem(core.PROFILE_MIGRATIONS, 0, lambda payload: {**payload, "version": 0})
+    with pytest.raises(ValueError):
+        core.migrate_profile({"adopted_pet_id": "momo"})
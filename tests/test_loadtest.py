@@ -0,0 +1,111 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from clawpet import cli, core
+from clawpet.cli import main
+from clawpet.core import interact
+from clawpet.loadtest import count_lost_updates, parse_mix, percentile, run_load_test
+
+
+def test_count_lost_updates_detects_overwritten_write():
+    seed = {"adopted_pet_id": "momo", "state": {"mood": 50, "energy": 50, "hunger": 50, "bond": 50}}
+    first = interact(seed, "feed")
+    second = interact(first, "play")
+    assert count_lost_updates(seed, [("feed", first["state"]), ("play", second["state"])]) == 0
+
+    racing = interact(seed, "rest")
+    assert count_lost_updates(seed, [("feed", first["state"]), ("rest", racing["state"])]) == 1
+
+
+def test_parse_mix_reads_weights():
+    assert parse_mix("status=3,catime") == {"status": 3, "catime": 1}
+
+
+@pytest.mark.parametrize("raw", ["status=0", "status=-1", "status=x", "bogus=1"])
+def test_parse_mix_rejects_invalid_entries(raw):
+    with pytest.raises(ValueError):
+        parse_mix(raw)
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile(list(range(1, 7)), 0.5) == 3
+    assert percentile(list(range(1, 23)), 0.5) == 11
+    assert percentile(list(range(1, 101)), 0.99) == 99
+    assert percentile([5.0], 0.99) == 5.0
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"concurrency": 0},
+        {"profiles": 0},
+        {"mix": {"status": 0}},
+        {"target": "http", "mix": {"catime": 1}},
+        {"target": "core", "address": "127.0.0.1:1"},
+    ],
+)
+def test_load_test_rejects_unusable_options(tmp_path: Path, options):
+    with pytest.raises(ValueError):
+        run_load_test(tmp_path, **options)
+    assert not (tmp_path / "profiles").exists()
+
+
+def test_load_test_against_core_entry_point(tmp_path: Path):
+    report = run_load_test(tmp_path, target="core", requests=20, concurrency=1, profiles=2, seed=1)
+    assert report["requests"] == 20
+    assert report["errors"] == 0
+    assert report["lost_updates"] == 0
+    assert sum(stats["count"] for stats in report["operations"].values()) == 20
+
+
+def test_load_test_against_http_service_serializes_writes(tmp_path: Path):
+    report = run_load_test(tmp_path, target="http", requests=40, concurrency=4, profiles=2, seed=2)
+    assert report["skipped_operations"] == ["catime"]
+    assert report["errors"] == 0
+    assert report["lost_updates"] == 0
+    assert report["corruption_incidents"] == 0
+
+
+def _write_counts(report: dict) -> int:
+    return sum(report["operations"][op]["count"] - report["operations"][op]["errors"] for op in ("care", "interact"))
+
+
+def test_concurrent_core_target_attributes_every_error_to_torn_profile_writes(tmp_path: Path):
+    report = run_load_test(
+        tmp_path, target="core", requests=200, concurrency=8, profiles=2, mix={"status": 1, "care": 1, "interact": 1}
+    )
+    assert sum(stats["count"] for stats in report["operations"].values()) == 200
+    # save_profile truncates before writing, so concurrent readers can see partial JSON.
+    # Every failure must be such a read, never a mixed-up capture of another thread's output.
+    assert report["errors"] == report["corruption_incidents"]
+    assert all("Invalid JSON in profile" in sample for sample in report["error_samples"])
+    assert 0 <= report["lost_updates"] <= _write_counts(report)
+
+
+def test_concurrent_core_target_is_clean_with_atomic_profile_writes(tmp_path: Path, monkeypatch):
+    original = core.save_profile
+
+    def atomic_save_profile(profile, profile_path=None):
+        scratch = profile_path.with_name(f".{profile_path.name}.{os.getpid()}.{id(profile)}.tmp")
+        original(profile, scratch)
+        os.replace(scratch, profile_path)
+        return profile_path
+
+    monkeypatch.setattr(cli, "save_profile", atomic_save_profile)
+    monkeypatch.setattr(core, "save_profile", atomic_save_profile)
+    report = run_load_test(
+        tmp_path, target="core", requests=200, concurrency=8, profiles=2, mix={"status": 1, "care": 1, "interact": 1}
+    )
+    assert report["errors"] == 0
+    assert report["corruption_incidents"] == 0
+    assert 0 <= report["lost_updates"] <= _write_counts(report)
+
+
+def test_cmd_loadtest_validates_before_creating_workdir(tmp_path: Path, capsys):
+    workdir = tmp_path / "work"
+    code = main(["loadtest", "--target", "core", "--url", "127.0.0.1:1", "--workdir", str(workdir)])
+    assert code == 2
+    assert not workdir.exists()
+    assert capsys.readouterr().err.startswith("Error:")
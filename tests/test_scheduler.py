@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+
+from clawpet.core import apply_passive_decay, auto_care_action
+from clawpet.scheduler import ReminderScheduler, threshold_crossings
+
+
+def _profile(hunger: int, energy: int, updated_at: str = "2026-02-12 00:00 UTC") -> dict:
+    return {
+        "adopted_pet_id": "momo",
+        "state": {"mood": 80, "energy": energy, "hunger": hunger, "bond": 50},
+        "updated_at": updated_at,
+    }
+
+
+def test_threshold_crossings_match_passive_decay():
+    profile = _profile(hunger=20, energy=80)
+    crossings = {event["reminder"]: event["due_at"] for event in threshold_crossings(profile)}
+    assert crossings["hungry"] == datetime(2026, 2, 12, 13, 0, tzinfo=timezone.utc)
+    assert crossings["tired"] == datetime(2026, 2, 12, 15, 0, tzinfo=timezone.utc)
+
+    just_before, _ = apply_passive_decay(profile, datetime(2026, 2, 12, 12, 59, tzinfo=timezone.utc))
+    at_crossing, _ = apply_passive_decay(profile, crossings["hungry"])
+    assert auto_care_action(just_before["state"]) == "play"
+    assert auto_care_action(at_crossing["state"]) == "feed"
+
+
+def test_threshold_already_crossed_is_due_immediately():
+    profile = _profile(hunger=90, energy=80)
+    crossings = {event["reminder"]: event["due_at"] for event in threshold_crossings(profile)}
+    assert crossings["hungry"] == datetime(2026, 2, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_scheduler_emits_due_events_and_drops_rescheduled_ones():
+    scheduler = ReminderScheduler()
+    scheduler.schedule("alice", _profile(hunger=66, energy=80))
+    scheduler.schedule("bob", _profile(hunger=20, energy=80))
+    assert scheduler.next_due() == datetime(2026, 2, 12, 1, 0, tzinfo=timezone.utc)
+
+    # Alice was fed, so her old events must not fire.
+    scheduler.schedule("alice", _profile(hunger=20, energy=80, updated_at="2026-02-12 00:30 UTC"))
+    due = scheduler.pop_due(datetime(2026, 2, 12, 13, 0, tzinfo=timezone.utc))
+    assert [event["key"] for event in due] == ["bob"]
+    assert due[0]["reminder"] == "hungry"
+    assert scheduler.next_due() == datetime(2026, 2, 12, 13, 30, tzinfo=timezone.utc)
@@ -0,0 +1,194 @@
+import http.client
+import json
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+from clawpet.cli import main
+from clawpet.core import adopt_pet, load_profile
+from clawpet.server import ClawpetClient, ClawpetService, ProfileStore, ServiceError, make_server
+
+
+@pytest.fixture
+def running_server(tmp_path: Path):
+    adopt_pet("momo", tmp_path / "profile.json")
+    store = ProfileStore(tmp_path / "profile.json", tmp_path / "profiles")
+    server = make_server("127.0.0.1", 0, ClawpetService(store))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = ClawpetClient("127.0.0.1", server.server_address[1])
+    yield client, tmp_path
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_server_status_and_interact_reuse_connection(running_server):
+    client, tmp_path = running_server
+    status = client.call("status")
+    assert status["pet"]["name_en"] == "Momo"
+
+    socket_before = client._connection.sock
+    fed = client.call("interact", action="feed")
+    assert client._connection.sock is socket_before
+    assert fed["state"]["hunger"] <= status["state"]["hunger"]
+    assert load_profile(tmp_path / "profile.json")["state"] == fed["state"]
+
+
+def test_server_batch_reports_per_item_errors(running_server):
+    client, _ = running_server
+    results = client.batch(
+        [
+            {"op": "pets"},
+            {"op": "show", "pet_id": "lingling"},
+            {"op": "show", "pet_id": "nope"},
+            {"op": "snapshot", "pet_id": "mochi"},
+        ]
+    )
+    assert [item["ok"] for item in results] == [True, True, False, True]
+    assert results[2]["status"] == 404
+    assert results[3]["result"]["image_url"].startswith("https://image.pollinations.ai/prompt/")
+
+
+def test_server_named_profiles_are_isolated(running_server):
+    client, tmp_path = running_server
+    client.call("care", profile="alice", action="play")
+    assert (tmp_path / "profiles" / "alice.json").exists()
+    with pytest.raises(ServiceError) as excinfo:
+        client.call("status", profile="../escape")
+    assert excinfo.value.status == 400
+
+
+def test_server_rejects_non_string_params_per_item(running_server):
+    client, _ = running_server
+    with pytest.raises(ServiceError) as excinfo:
+        client.call("status", profile=123)
+    assert excinfo.value.status == 400
+
+    results = client.batch([{"op": "show", "pet_id": ["x"]}, {"op": "show", "pet_id": "momo"}])
+    assert [item["ok"] for item in results] == [False, True]
+    assert results[0]["status"] == 400
+
+
+def test_server_rejects_invalid_content_length(running_server):
+    client, _ = running_server
+    connection = client._connection
+    connection.putrequest("POST", "/status")
+    connection.putheader("Content-Length", "abc")
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    response.read()
+
+
+def test_cli_import_does_not_load_http_stack():
+    result = subprocess.run(
+        [sys.executable, "-c", "import sys, clawpet.cli; print('clawpet.server' in sys.modules)"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_server_reports_broken_profiles_as_server_errors(running_server):
+    client, tmp_path = running_server
+    (tmp_path / "profile.json").write_text("[]", encoding="utf-8")
+    with pytest.raises(ServiceError) as excinfo:
+        client.call("status")
+    assert excinfo.value.status == 500
+
+    (tmp_path / "profile.json").write_text("{not json", encoding="utf-8")
+    results = client.batch([{"op": "status"}, {"op": "pets"}])
+    assert results[0] == {"ok": False, "status": 500, "error": results[0]["error"]}
+    assert "Invalid JSON in profile" in results[0]["error"]
+    assert results[1]["ok"] is True
+
+
+def test_server_answers_unexpected_errors_with_json(tmp_path: Path):
+    (tmp_path / "not-a-dir").write_text("", encoding="utf-8")
+    service = ClawpetService(ProfileStore(tmp_path / "profile.json", tmp_path / "not-a-dir"))
+    results = service.batch([{"op": "care", "profile": "alice"}, {"op": "show", "pet_id": "momo"}])
+    assert [item["ok"] for item in results] == [False, True]
+    assert results[0]["status"] == 500
+    assert results[0]["error"].startswith("Internal error: NotADirectoryError")
+
+
+def test_server_drains_get_body_before_next_keep_alive_request(running_server):
+    client, _ = running_server
+    host, port = client._connection.host, client._connection.port
+    with socket.create_connection((host, port), timeout=10) as sock:
+        sock.sendall(
+            b"GET /pets HTTP/1.1\r\nHost: x\r\nContent-Length: 7\r\n\r\njunk!!!"
+            b"GET /status HTTP/1.1\r\nHost: x\r\n\r\n"
+        )
+        reader = sock.makefile("rb")
+        statuses = []
+        for _ in range(2):
+            statuses.append(reader.readline().split()[1])
+            length = 0
+            while (line := reader.readline()) not in (b"\r\n", b""):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            body = json.loads(reader.read(length))
+        assert statuses == [b"200", b"200"]
+        assert body["pet"]["name_en"] == "Momo"
+
+
+class _DropSecondRequest(socketserver.StreamRequestHandler):
+    """Answers the first request on a connection, then drops the connection after the next one."""
+
+    def handle(self):
+        served = 0
+        while True:
+            headers = []
+            while (line := self.rfile.readline()) not in (b"\r\n", b""):
+                headers.append(line)
+            if not headers:
+                return
+            length = next(int(h.split(b":")[1]) for h in headers if h.lower().startswith(b"content-length:"))
+            self.rfile.read(length)
+            self.server.received += 1
+            served += 1
+            if served > 1:
+                return
+            self.wfile.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}")
+
+
+@pytest.fixture
+def dropping_server():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _DropSecondRequest)
+    server.daemon_threads = True
+    server.received = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_client_never_resends_write_ops(dropping_server):
+    client = ClawpetClient("127.0.0.1", dropping_server.server_address[1])
+    client.call("status")
+    with pytest.raises((ConnectionError, http.client.HTTPException)):
+        client.call("interact", action="feed")
+    assert dropping_server.received == 2
+    client.close()
+
+
+def test_client_retries_reads_on_dropped_keep_alive(dropping_server):
+    client = ClawpetClient("127.0.0.1", dropping_server.server_address[1])
+    client.call("status")
+    assert client.call("status") == {}
+    assert dropping_server.received == 3
+    client.close()
+
+
+def test_service_payloads_match_cli_json(capsys):
+    assert main(["snapshot", "--pet-id", "lingling", "--place", "a library", "--json"]) == 0
+    cli_payload = json.loads(capsys.readouterr().out)
+    assert ClawpetService().dispatch("snapshot", {"pet_id": "lingling", "place": "a library"}) == cli_payload
@@ -0,0 +1,132 @@
+import multiprocessing
+from pathlib import Path
+
+import pytest
+
+from clawpet.core import adopt_pet
+from clawpet.server import ClawpetService, ProfileStore
+from clawpet.sharedstate import SEQ, SharedStateTable, _key_digest
+
+
+@pytest.fixture
+def table():
+    table = SharedStateTable.create(slots=8)
+    yield table
+    table.close()
+
+
+def _read_from_worker(name: str, key: str, queue) -> None:
+    attached = SharedStateTable.attach(name)
+    queue.put(attached.get(key))
+    attached.close()
+
+
+def _hammer(name: str, key: str, value: int, rounds: int) -> None:
+    attached = SharedStateTable.attach(name)
+    profile = {
+        "adopted_pet_id": "momo" if value < 50 else "mochi",
+        "state": {"mood": value, "energy": value, "hunger": value, "bond": value},
+        "updated_at": "2026-02-12 03:45 UTC",
+    }
+    for _ in range(rounds):
+        attached.put(key, profile)
+    attached.close()
+
+
+def test_shared_state_round_trip_across_processes(table):
+    profile = {
+        "adopted_pet_id": "mochi",
+        "state": {"mood": 81, "energy": 42, "hunger": 67, "bond": 12},
+        "updated_at": "2026-02-12 03:45 UTC",
+    }
+    assert table.put("alice", profile)
+    assert table.get("bob") is None
+
+    queue = multiprocessing.get_context("spawn").Queue()
+    worker = multiprocessing.get_context("spawn").Process(target=_read_from_worker, args=(table.name, "alice", queue))
+    worker.start()
+    assert queue.get(timeout=30) == profile
+    worker.join(timeout=30)
+
+
+def test_shared_state_rejects_unknown_pet_and_full_table(table):
+    state = {"mood": 50, "energy": 50, "hunger": 50, "bond": 50}
+    assert not table.put("ghost", {"adopted_pet_id": "nope", "state": state, "updated_at": ""})
+    for index in range(table.slots):
+        assert table.put(f"pet-{index}", {"adopted_pet_id": "momo", "state": state, "updated_at": ""})
+    assert not table.put("one-too-many", {"adopted_pet_id": "momo", "state": state, "updated_at": ""})
+
+
+def test_profile_store_serves_status_from_shared_table(table, tmp_path: Path):
+    profile_file = tmp_path / "profile.json"
+    adopt_pet("captain", profile_file)
+    writer = ClawpetService(ProfileStore(profile_file, state_table=table))
+    reader = ClawpetService(ProfileStore(profile_file, state_table=table))
+
+    fed = writer.dispatch("interact", {"action": "feed"})
+    profile_file.unlink()
+    assert reader.dispatch("status", {})["state"] == fed["state"]
+
+
+def test_shared_state_concurrent_writers_never_tear_records(table):
+    context = multiprocessing.get_context("spawn")
+    writers = [context.Process(target=_hammer, args=(table.name, "shared", value, 20000)) for value in (10, 90)]
+    for writer in writers:
+        writer.start()
+
+    observed = set()
+    while any(writer.is_alive() for writer in writers):
+        record = table.get("shared")
+        if record is not None:
+            observed.add((record["adopted_pet_id"], *record["state"].values()))
+    for writer in writers:
+        writer.join(timeout=60)
+        assert writer.exitcode == 0
+
+    assert observed <= {("momo", 10, 10, 10, 10), ("mochi", 90, 90, 90, 90)}
+    # Serialized writers each advance the seqlock by exactly two.
+    offset, _ = table._find(_key_digest("shared"))
+    assert SEQ.unpack_from(table._buf, offset)[0] == 2 * 2 * 20000
+
+
+def test_shared_state_repairs_slot_left_odd_by_crashed_writer(table):
+    profile = {
+        "adopted_pet_id": "momo",
+        "state": {"mood": 1, "energy": 2, "hunger": 3, "bond": 4},
+        "updated_at": "2026-02-12 03:45 UTC",
+    }
+    table.put("alice", profile)
+    offset, _ = table._find(_key_digest("alice"))
+    SEQ.pack_into(table._buf, offset, SEQ.unpack_from(table._buf, offset)[0] + 1)
+
+    assert table.get("alice") is None
+    assert table.put("alice", profile)
+    assert table.get("alice") == profile
+    assert SEQ.unpack_from(table._buf, offset)[0] % 2 == 0
+
+
+def test_put_if_absent_keeps_newer_record(table):
+    old = {"adopted_pet_id": "momo", "state": {"mood": 1, "energy": 1, "hunger": 1, "bond": 1}, "updated_at": ""}
+    new = {"adopted_pet_id": "momo", "state": {"mood": 9, "energy": 9, "hunger": 9, "bond": 9}, "updated_at": ""}
+    assert table.put("alice", new)
+    assert not table.put_if_absent("alice", old)
+    assert table.get("alice") == new
+    assert table.put_if_absent("bob", old)
+
+
+def test_last_close_removes_block_and_lock_file():
+    first = SharedStateTable.open("clawpet-test-refcount", slots=4)
+    second = SharedStateTable.open("clawpet-test-refcount", slots=4)
+    lock_path = first._lock.path
+    first.close()
+    assert lock_path.exists()
+    assert second.get("nobody") is None
+
+    second.close()
+    assert not lock_path.exists()
+    with pytest.raises(FileNotFoundError):
+        SharedStateTable.attach("clawpet-test-refcount")
+
+    fresh = SharedStateTable.open("clawpet-test-refcount", slots=4)
+    assert fresh.put("alice", {"adopted_pet_id": "momo", "state": {"mood": 1, "energy": 1, "hunger": 1, "bond": 1}, "updated_at": ""})
+    fresh.close()